@@ -1,53 +1,182 @@
 import dash
-from dash import html, dcc, Input, Output, State
+from dash import html, dcc, Input, Output, State, Patch
+import functools
+import json
+import numpy as np
 import pandas as pd
+import io
 import os
+import threading
 import time
 import uuid
 from databricks.sdk import WorkspaceClient
 import psycopg
+from psycopg import sql
 from psycopg_pool import ConnectionPool
 import plotly.graph_objects as go
 from datetime import datetime
+from flask_compress import Compress
+from numba import njit, prange
 import atexit
 
 # ============================================================
 # Database Configuration with Auto-Refreshing OAuth Tokens
 # ============================================================
-w = WorkspaceClient()
+@functools.lru_cache(maxsize=1)
+def get_workspace_client() -> WorkspaceClient:
+    """One shared WorkspaceClient per process, built on first use."""
+    return WorkspaceClient()
 
-# Get current user information
-current_user = w.current_user.me()
-print(f"🔐 Current User: {current_user.user_name}")
-print(f"   User ID: {current_user.id}")
+USER_CACHE_PATH = '/tmp/db_user_cache.json'
+USER_CACHE_TTL_SECONDS = 24 * 3600
+
+def _user_cache_key():
+    """Cache key tied to the authenticating principal, not just the host.
+
+    The cached user becomes the database login, so a profile or service
+    principal switch against the same workspace must miss the cache.
+    """
+    return '|'.join((
+        os.getenv('DATABRICKS_HOST', ''),
+        os.getenv('DATABRICKS_CLIENT_ID', ''),
+        os.getenv('DATABRICKS_AUTH_TYPE', ''),
+    ))
+
+def invalidate_user_cache():
+    """Drop the cached identity so the next start re-resolves it live."""
+    try:
+        os.unlink(USER_CACHE_PATH)
+    except OSError:
+        pass
+
+def get_current_user_info():
+    """Resolve the Databricks user, cached on disk with a 24h TTL.
+
+    current_user.me() is a network round-trip at import time; with several
+    gunicorn workers each one would repeat it. The JSON cache makes sibling
+    workers and restarts free, falling back to a live fetch on a miss.
+    """
+    cache_key = _user_cache_key()
+    try:
+        if time.time() - os.stat(USER_CACHE_PATH).st_mtime < USER_CACHE_TTL_SECONDS:
+            with open(USER_CACHE_PATH) as f:
+                cached = json.load(f)
+            if cached.get('key') == cache_key:
+                return cached['user_name'], cached['id']
+    except (OSError, ValueError):
+        pass
+
+    me = get_workspace_client().current_user.me()
+    try:
+        with open(USER_CACHE_PATH, 'w') as f:
+            json.dump({'key': cache_key, 'user_name': me.user_name, 'id': me.id}, f)
+    except OSError:
+        pass
+    return me.user_name, me.id
+
+# Get current user information (disk-cached across workers and restarts)
+user_name, user_id = get_current_user_info()
+print(f"🔐 Current User: {user_name}")
+print(f"   User ID: {user_id}")
+
+class TokenCache:
+    """Keeps a warm database OAuth token so connect() never does network I/O.
+
+    A daemon thread refreshes the credential well before expiry; new pool
+    connections just read the current token instead of paying an HTTPS
+    round-trip to the control plane on every connect.
+    """
+
+    REFRESH_MARGIN_SECONDS = 300   # refresh 5 minutes before expiry
+    TOKEN_LIFETIME_SECONDS = 3600  # Lakebase credentials last about an hour
+
+    def __init__(self, instance_name: str):
+        self.instance_name = instance_name
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0
+
+    def _refresh(self):
+        cred = get_workspace_client().database.generate_database_credential(
+            request_id=str(uuid.uuid4()),
+            instance_names=[self.instance_name]
+        )
+        with self._lock:
+            self._token = cred.token
+            self._expires_at = time.time() + self.TOKEN_LIFETIME_SECONDS
+
+    def get(self) -> str:
+        """Return the cached token, refreshing inline only if it went stale."""
+        with self._lock:
+            token = self._token
+            expires_at = self._expires_at
+        if token is None or time.time() > expires_at - self.REFRESH_MARGIN_SECONDS:
+            self._refresh()
+            with self._lock:
+                token = self._token
+        return token
+
+    def start_refresher(self):
+        """Start the background thread that keeps the token warm."""
+        def _loop():
+            while True:
+                with self._lock:
+                    expires_at = self._expires_at
+                time.sleep(min(max(expires_at - time.time() - self.REFRESH_MARGIN_SECONDS, 1), 60))
+                try:
+                    with self._lock:
+                        stale = time.time() > self._expires_at - self.REFRESH_MARGIN_SECONDS
+                    if stale:
+                        self._refresh()
+                except Exception as e:
+                    print(f"❌ Token refresh failed (will retry): {e}")
+        threading.Thread(target=_loop, daemon=True, name="token-refresher").start()
 
 class RotatingTokenConnection(psycopg.Connection):
-    """psycopg3 Connection that injects a fresh OAuth token as the password."""
-    
+    """psycopg3 Connection that injects the cached OAuth token as the password."""
+
     @classmethod
     def connect(cls, conninfo: str = "", **kwargs):
-        # Generate fresh token for each connection
-        kwargs["password"] = w.database.generate_database_credential(
-            request_id=str(uuid.uuid4()),
-            instance_names=[kwargs.pop("_instance_name")]
-        ).token
+        # Read the pre-warmed token; no I/O on the connect path
+        kwargs["password"] = TOKEN_CACHE.get()
         kwargs.setdefault("sslmode", "require")
-        return super().connect(conninfo, **kwargs)
+        try:
+            return super().connect(conninfo, **kwargs)
+        except psycopg.OperationalError:
+            # A stale cached identity means every login here is for the
+            # wrong user until the TTL expires; drop it so the next
+            # process start resolves the principal live
+            invalidate_user_cache()
+            raise
 
+@functools.lru_cache(maxsize=None)
 def build_pool(instance_name: str, host: str, user: str, database: str) -> ConnectionPool:
-    """Build connection pool with auto-rotating OAuth tokens"""
+    """Build the connection pool for this process (memoized: one pool per config).
+
+    Sizing follows the usual Postgres pooling guidance: enough warm
+    connections for the concurrent callbacks, headroom for bursts of
+    viewers, and a lifetime shorter than the OAuth token's so connections
+    recycle before their credential expires.
+    """
     print(f"🔌 Building connection pool:")
     print(f"   Instance: {instance_name}")
     print(f"   Host: {host}")
     print(f"   Database: {database}")
     print(f"   User: {user}")
-    
+
     return ConnectionPool(
         conninfo=f"host={host} dbname={database} user={user}",
         connection_class=RotatingTokenConnection,
-        kwargs={"_instance_name": instance_name},
-        min_size=2,
-        max_size=10,
+        # Fixed floor: enough for the interval callbacks landing together.
+        # Deriving it from os.cpu_count() read the host's core count in
+        # containers and could exceed max_size, which ConnectionPool
+        # rejects at construction
+        min_size=4,
+        max_size=25,
+        max_waiting=100,
+        timeout=5,
+        max_lifetime=1800,
+        check=ConnectionPool.check_connection,
         open=True,
     )
 
@@ -55,9 +184,13 @@ def build_pool(instance_name: str, host: str, user: str, database: str) -> Conne
 INSTANCE_NAME = os.getenv('INSTANCE_NAME', 'kunal-gaurav-lakebase-instance')
 PGDATABASE = os.getenv('PGDATABASE', 'pg_lakebase_kunal-gaurav')
 PGHOST = os.getenv('PGHOST', 'instance-f60d62f1-e44a-43c7-813f-58138e0552fd.database.cloud.databricks.com')
-PGUSER = current_user.user_name  # Use current user from Databricks
+PGUSER = user_name  # Use current user from Databricks
 print(f"🔐 PGUSER: {PGUSER}")
 
+# Warm the OAuth token before the pool opens its first connections
+TOKEN_CACHE = TokenCache(INSTANCE_NAME)
+TOKEN_CACHE.start_refresher()
+
 # Create connection pool with auto-rotating tokens
 connection_pool = build_pool(INSTANCE_NAME, PGHOST, PGUSER, PGDATABASE)
 print("✅ Connection pool created with auto-rotating OAuth tokens")
@@ -75,27 +208,204 @@ def get_connection():
 # ============================================================
 # Data Fetching (cached)
 # ============================================================
-data_cache = {'df': pd.DataFrame(), 'timestamp': 0}
+data_cache = {'df': pd.DataFrame(), 'by_region': {}, 'arrays': None,
+              'watermark': None, 'timestamp': 0}
+_cache_lock = threading.Lock()
+CACHE_TTL_SECONDS = 25  # just under the 30s fast interval: one query per tick
+MAX_CACHE_ROWS = 500_000  # bound on the incrementally-grown cached frame
+
+def _fetch_iot_frame(conn, since=None):
+    """COPY the telemetry table out as CSV and parse it straight into pandas.
+
+    psycopg's COPY streams raw bytes without building a Python tuple per row,
+    which is much faster and lighter than pd.read_sql for a full-table scan.
+    With `since` set, only rows newer than that watermark come over the wire.
+    """
+    where = (sql.SQL("WHERE timestamp > {}").format(sql.Literal(since))
+             if since is not None else sql.SQL(""))
+    copy_sql = sql.SQL("""
+        COPY (
+            SELECT tower_id, region, timestamp,
+                   data_usage_mb, active_users, call_drop_rate
+            FROM telcom.iot_data_synced
+            {where}
+        ) TO STDOUT (FORMAT CSV, HEADER)
+    """).format(where=where)
+    buf = io.BytesIO()
+    with conn.cursor() as cur:
+        with cur.copy(copy_sql) as cpy:
+            for chunk in cpy:
+                buf.write(chunk)
+    buf.seek(0)
+    # float32/int32 are plenty for 2-decimal display and halve the frame's
+    # memory footprint (and the bandwidth of every downstream aggregation)
+    df = pd.read_csv(
+        buf,
+        parse_dates=['timestamp'],
+        dtype={
+            'data_usage_mb': 'float32',
+            'call_drop_rate': 'float32',
+            'active_users': 'int32',
+        },
+    )
+    # Dictionary-encode the region column: repeated strings become int codes
+    df['region'] = df['region'].astype('category')
+    return df
 
 def get_iot_data():
-    global data_cache
-    try:
-        with get_connection() as conn:
+    """Fetch IoT data, serving the cached frame while it is still fresh.
+
+    Multiple callbacks fire on the same interval tick; the TTL cache means
+    only the first one pays for the query and the rest reuse the DataFrame.
+    """
+    if time.time() - data_cache['timestamp'] < CACHE_TTL_SECONDS:
+        return data_cache['df']
+
+    with _cache_lock:
+        # Re-check: another callback may have refreshed while we waited
+        if time.time() - data_cache['timestamp'] < CACHE_TTL_SECONDS:
+            return data_cache['df']
+        try:
+            old = data_cache['df']
+            watermark = data_cache['watermark']
+            since = watermark.to_pydatetime() if watermark is not None else None
+            with get_connection() as conn:
+                new_rows = _fetch_iot_frame(conn, since=since)
+
+            if new_rows.empty and not old.empty:
+                # Nothing inserted since last tick: derived caches stay valid
+                data_cache['timestamp'] = time.time()
+                return old
+
+            if old.empty:
+                df = new_rows
+            else:
+                df = pd.concat([old, new_rows], ignore_index=True, copy=False)
+                # concat of categoricals can fall back to object; re-encode
+                df['region'] = df['region'].astype('category')
+                if len(df) > MAX_CACHE_ROWS:
+                    df = df.iloc[-MAX_CACHE_ROWS:].reset_index(drop=True)
+
+            data_cache['df'] = df
+            # Pre-split per region so callbacks filter via dict lookup
+            data_cache['by_region'] = {
+                r: sub for r, sub in df.groupby('region', observed=True, sort=False)
+            }
+            data_cache['arrays'] = _build_soa(df)
+            data_cache['watermark'] = df['timestamp'].max() if not df.empty else None
+            data_cache['timestamp'] = time.time()
+            return df
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            if not data_cache['df'].empty:
+                return data_cache['df']
+            return pd.DataFrame()
+
+def _build_soa(df):
+    """Structure-of-arrays view of the frame for the jitted KPI kernel.
+
+    Contiguous numeric arrays with dictionary-encoded tower/region codes:
+    exactly the layout Numba reduces over at memory bandwidth.
+    """
+    tower_cat = df['tower_id'].astype('category').cat
+    region_cat = df['region'].cat
+    return {
+        'ts_ns': np.ascontiguousarray(df['timestamp'].to_numpy('datetime64[ns]').view('i8')),
+        'active_users': np.ascontiguousarray(df['active_users'].to_numpy(np.int64)),
+        'data_usage_mb': np.ascontiguousarray(df['data_usage_mb'].to_numpy(np.float32)),
+        'call_drop_rate': np.ascontiguousarray(df['call_drop_rate'].to_numpy(np.float32)),
+        'tower_codes': np.ascontiguousarray(tower_cat.codes.to_numpy(np.int16)),
+        'n_towers': len(tower_cat.categories),
+        'region_codes': np.ascontiguousarray(region_cat.codes.to_numpy(np.int8)),
+        'region_values': list(region_cat.categories),
+    }
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _kpi_kernel(active_users, data_usage, drop_rate, tower_codes, region_codes,
+                region_code, n_towers):
+    """Single fused pass: sums, drop-rate mean and distinct-tower count.
+
+    region_code < 0 means "all regions". The tower bitset store is
+    idempotent, so the parallel loop is race-free.
+    """
+    total_users = 0
+    total_data = 0.0
+    drop_sum = 0.0
+    n = 0
+    seen = np.zeros(n_towers, dtype=np.uint8)
+    for i in prange(len(active_users)):
+        if region_code < 0 or region_codes[i] == region_code:
+            total_users += active_users[i]
+            total_data += data_usage[i]
+            drop_sum += drop_rate[i]
+            n += 1
+            seen[tower_codes[i]] = 1
+    return total_users, total_data, drop_sum, n, int(seen.sum())
+
+def compute_kpis(region):
+    """Run the KPI reductions on the cached SoA arrays for one region."""
+    arrays = data_cache['arrays']
+    if region:
+        try:
+            region_code = arrays['region_values'].index(region)
+        except ValueError:
+            # Unknown region matches nothing
+            return {'users': 0, 'data_mb': 0.0, 'avg_drop': 0.0, 'towers': 0}
+    else:
+        region_code = -1  # all regions
+    users, data_mb, drop_sum, n, towers = _kpi_kernel(
+        arrays['active_users'], arrays['data_usage_mb'], arrays['call_drop_rate'],
+        arrays['tower_codes'], arrays['region_codes'],
+        region_code, arrays['n_towers'],
+    )
+    return {
+        'users': int(users),
+        'data_mb': float(data_mb),
+        'avg_drop': drop_sum / n if n else 0.0,
+        'towers': towers,
+    }
+
+def filter_region(df, region):
+    """Return the precomputed slice for a region (O(1)) or the full frame."""
+    if not region:
+        return df
+    sub = data_cache['by_region'].get(region)
+    return sub if sub is not None else df.iloc[0:0]
+
+summary_cache = {'df': pd.DataFrame(), 'timestamp': 0}
+SUMMARY_TTL_SECONDS = 55  # just under the 60s slow interval
+
+def get_region_summary():
+    """Per-region aggregates for the pie and bar charts, computed in SQL.
+
+    The static charts only need a handful of numbers per region, so let
+    Postgres do the GROUP BY instead of shipping every row to pandas.
+    """
+    if time.time() - summary_cache['timestamp'] < SUMMARY_TTL_SECONDS:
+        return summary_cache['df']
+
+    with _cache_lock:
+        if time.time() - summary_cache['timestamp'] < SUMMARY_TTL_SECONDS:
+            return summary_cache['df']
+        try:
             query = """
-                SELECT *
+                SELECT region,
+                       SUM(active_users)    AS total_users,
+                       AVG(data_usage_mb)   AS avg_data_usage_mb,
+                       AVG(active_users)    AS avg_active_users,
+                       AVG(call_drop_rate)  AS avg_call_drop_rate
                 FROM telcom.iot_data_synced
-               
-                ORDER BY timestamp DESC
+                GROUP BY region
+                ORDER BY region
             """
-            df = pd.read_sql(query, conn)
-            data_cache['df'] = df
-            data_cache['timestamp'] = time.time()
+            with get_connection() as conn:
+                df = pd.read_sql(query, conn)
+            summary_cache['df'] = df
+            summary_cache['timestamp'] = time.time()
             return df
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        if not data_cache['df'].empty:
-            return data_cache['df']
-        return pd.DataFrame()
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            return summary_cache['df']
 
 # ============================================================
 # Dash App
@@ -105,6 +415,12 @@ app = dash.Dash(__name__,
 
 app.title = "📡 Telecom IoT Dashboard"
 
+# Figure JSON is highly compressible: gzip/brotli shrink responses 5-10x.
+# Config must be set before init: Compress resolves these keys in init_app
+app.server.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.server.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app.server)
+
 # ============================================================
 # CSS - NO FLICKERING
 # ============================================================
@@ -322,6 +638,15 @@ app.layout = html.Div([
     dcc.Interval(id='interval-fast', interval=30000, n_intervals=0),
     dcc.Interval(id='interval-slow', interval=60000, n_intervals=0),
 
+    # Debounced mirror of the region dropdown (see clientside callback)
+    dcc.Store(id='region-debounced'),
+
+    # Raw KPI numbers; formatting happens clientside
+    dcc.Store(id='kpi-store'),
+
+    # Tower set pinned at chart initialization; extend ticks reuse it
+    dcc.Store(id='pinned-towers'),
+
     # Charts
     html.Div([
         
@@ -377,6 +702,26 @@ app.layout = html.Div([
 
 ], style={'minHeight': '100vh', 'paddingBottom': '40px'})
 
+# ============================================================
+# Debounce: only the last region change in a 300ms burst does work
+# ============================================================
+app.clientside_callback(
+    """
+    function(value) {
+        return new Promise(function(resolve) {
+            if (window._regionDebounceTimer) {
+                clearTimeout(window._regionDebounceTimer);
+            }
+            window._regionDebounceTimer = setTimeout(function() {
+                resolve(value === undefined ? null : value);
+            }, 300);
+        });
+    }
+    """,
+    Output('region-debounced', 'data'),
+    Input('region-filter', 'value')
+)
+
 # ============================================================
 # CALLBACK 1: Initialize Charts (runs once)
 # ============================================================
@@ -384,8 +729,9 @@ app.layout = html.Div([
     [Output('chart-data-usage', 'figure'),
      Output('chart-users', 'figure'),
      Output('chart-gauge', 'figure'),
-     Output('region-filter', 'options')],
-    [Input('region-filter', 'value')],
+     Output('region-filter', 'options'),
+     Output('pinned-towers', 'data')],
+    [Input('region-debounced', 'data')],
     prevent_initial_call=False
 )
 def initialize_charts(region):
@@ -405,21 +751,26 @@ def initialize_charts(region):
         empty.add_annotation(text="No Data Available", font=dict(size=20, color="gray"), 
                            showarrow=False, xref="paper", yref="paper", x=0.5, y=0.5)
         empty.update_layout(template="plotly_white", height=380, paper_bgcolor='white')
-        return empty, empty, empty, regions
-    
-    df_filtered = df[df['region'] == region] if region else df
+        return empty, empty, empty, regions, []
+
+    df_filtered = filter_region(df, region)
     colors = ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b']
-    
+
+    # Pin the tower set for this session; extend ticks reuse it as State
+    towers = list(df_filtered['tower_id'].unique()[:5])
+
     # Chart 1: Data Usage
     fig1 = go.Figure()
-    for idx, tower in enumerate(df_filtered['tower_id'].unique()[:5]):
+    for idx, tower in enumerate(towers):
         tower_df = df_filtered[df_filtered['tower_id'] == tower].sort_values('timestamp').tail(100)
-        fig1.add_trace(go.Scatter(
+        # Scattergl renders via WebGL: repaint cost stays flat as extendData
+        # grows the traces (no spline support, so lines stay linear)
+        fig1.add_trace(go.Scattergl(
             x=tower_df['timestamp'],
             y=tower_df['data_usage_mb'],
             name=tower,
             mode='lines+markers',
-            line=dict(width=3, shape='spline', color=colors[idx]),
+            line=dict(width=3, color=colors[idx]),
             marker=dict(size=6, line=dict(width=2, color='white')),
             hovertemplate='<b>%{fullData.name}</b><br>%{x|%H:%M:%S}<br>%{y:.1f} MB<extra></extra>'
         ))
@@ -441,7 +792,7 @@ def initialize_charts(region):
     
     # Chart 2: Active Users
     fig2 = go.Figure()
-    for idx, tower in enumerate(df_filtered['tower_id'].unique()[:5]):
+    for idx, tower in enumerate(towers):
         tower_df = df_filtered[df_filtered['tower_id'] == tower].sort_values('timestamp').tail(100)
         fig2.add_trace(go.Scatter(
             x=tower_df['timestamp'],
@@ -502,119 +853,119 @@ def initialize_charts(region):
         uirevision='gauge'
     )
     
-    return fig1, fig2, fig3, regions
+    return fig1, fig2, fig3, regions, towers
 
 # ============================================================
-# CALLBACK 2: Extend Time Series (30s - NO REDRAW)
+# CALLBACK 2: Fast tick (30s): extend series, KPIs and gauge in ONE POST
 # ============================================================
 @app.callback(
     [Output('chart-data-usage', 'extendData'),
      Output('chart-users', 'extendData'),
-     Output('kpi-users', 'children'),
-     Output('kpi-data', 'children'),
-     Output('kpi-signal', 'children'),
-     Output('kpi-towers', 'children'),
-     Output('last-update', 'children')],
+     Output('kpi-store', 'data'),
+     Output('chart-gauge', 'figure', allow_duplicate=True)],
     [Input('interval-fast', 'n_intervals')],
-    [State('region-filter', 'value')]
+    [State('region-filter', 'value'),
+     State('pinned-towers', 'data')],
+    prevent_initial_call=True
 )
-def extend_timeseries(n, region):
-    """Extend charts smoothly without redrawing"""
-    
+def extend_timeseries(n, region, pinned_towers):
+    """Extend charts smoothly without redrawing; KPIs go raw to the store"""
+
     if n == 0:
-        return [None, None, '0', '0 GB', '0 dBm', '0', 'Initializing...']
-    
+        return [None, None, None, dash.no_update]
+
     df = get_iot_data()
-    
+
     if df.empty:
-        return [None, None, '0', '0 GB', '0 dBm', '0', 'No data']
-    
-    df_filtered = df[df['region'] == region] if region else df
-    
+        return [None, None, {'users': 0, 'data_gb': 0, 'signal': 0, 'towers': 0,
+                             'status': 'No data'}, dash.no_update]
+
+    df_filtered = filter_region(df, region)
+
+    # KPIs via the jitted single-pass kernel; clientside callback formats them
+    kpis_raw = compute_kpis(region)
+    kpis = {
+        'users': kpis_raw['users'],
+        'data_gb': round(kpis_raw['data_mb'] / 1024, 2),
+        'signal': round(kpis_raw['avg_drop'], 1),
+        'towers': kpis_raw['towers'],
+        'status': f"Live • {datetime.now().strftime('%H:%M:%S')}",
+    }
+
+    # Gauge patch rides along in the same response as the extend data
+    if kpis_raw['towers'] > 0:
+        avg_drop = kpis_raw['avg_drop']
+        if avg_drop < 1:
+            avg_drop = avg_drop * 100
+        gauge_patch = Patch()
+        gauge_patch['data'][0]['value'] = float(avg_drop)
+        gauge_patch['data'][0]['delta']['reference'] = 2.0
+    else:
+        gauge_patch = dash.no_update
+
     # Get only NEW data (last 30 seconds)
     latest_time = df_filtered['timestamp'].max()
     new_data = df_filtered[df_filtered['timestamp'] >= (latest_time - pd.Timedelta(seconds=30))]
-    
+
     if new_data.empty:
         # No new data, just update KPIs
-        total_users = int(df_filtered['active_users'].sum())
-        total_data = df_filtered['data_usage_mb'].sum() / 1024
-        avg_signal = df_filtered['call_drop_rate'].mean() 
-        total_towers = df_filtered['tower_id'].nunique()
-        
-        return [
-            None, None,
-            f"{total_users:,}",
-            f"{total_data:.2f} GB",
-            f"{avg_signal:.1f} dBm" if avg_signal > 0 else "N/A",
-            f"{total_towers}",
-            f"Live • {datetime.now().strftime('%H:%M:%S')}"
-        ]
-    
-    # KPIs
-    total_users = int(df_filtered['active_users'].sum())
-    total_data = df_filtered['data_usage_mb'].sum() / 1024
-    avg_signal = df_filtered['call_drop_rate'].mean() 
-    total_towers = df_filtered['tower_id'].nunique()
-    
-    # Prepare extend data for Chart 1 (Data Usage)
+        return [None, None, kpis, gauge_patch]
+
+    # One sort + one groupby pass instead of a mask + sort per tower per chart.
+    # The tower set was pinned at initialization, so no per-tick unique() scan.
+    top_towers = pinned_towers or list(df_filtered['tower_id'].unique()[:5])
+    groups = dict(list(new_data.sort_values('timestamp').groupby('tower_id', sort=False)))
+    empty_group = new_data.iloc[0:0]
+
     extend_data_usage = {'x': [], 'y': []}
-    for tower in df_filtered['tower_id'].unique()[:5]:
-        tower_new = new_data[new_data['tower_id'] == tower].sort_values('timestamp')
-        extend_data_usage['x'].append(tower_new['timestamp'].tolist())
-        extend_data_usage['y'].append(tower_new['data_usage_mb'].tolist())
-    
-    # Prepare extend data for Chart 2 (Active Users)
     extend_users = {'x': [], 'y': []}
-    for tower in df_filtered['tower_id'].unique()[:5]:
-        tower_new = new_data[new_data['tower_id'] == tower].sort_values('timestamp')
-        extend_users['x'].append(tower_new['timestamp'].tolist())
-        extend_users['y'].append(tower_new['active_users'].tolist())
-    
+    for tower in top_towers:
+        tower_new = groups.get(tower, empty_group)
+        # One vectorized datetime64 -> ISO-string conversion per tower,
+        # instead of boxing a Timestamp object per row
+        ts = np.datetime_as_string(
+            tower_new['timestamp'].to_numpy('datetime64[s]'), unit='s'
+        ).tolist()
+        extend_data_usage['x'].append(ts)
+        extend_data_usage['y'].append(tower_new['data_usage_mb'].to_numpy().tolist())
+        extend_users['x'].append(ts)
+        extend_users['y'].append(tower_new['active_users'].to_numpy().tolist())
+
+    trace_indices = list(range(len(top_towers)))
     return [
-        (extend_data_usage, list(range(5)), 200),  # Keep last 200 points
-        (extend_users, list(range(5)), 200),
-        f"{total_users:,}",
-        f"{total_data:.2f} GB",
-        f"{avg_signal:.1f} dBm" if avg_signal > 0 else "N/A",
-        f"{total_towers}",
-        f"Live • {datetime.now().strftime('%H:%M:%S')}"
+        (extend_data_usage, trace_indices, 200),  # Keep last 200 points
+        (extend_users, trace_indices, 200),
+        kpis,
+        gauge_patch
     ]
 
-# ============================================================
-# CALLBACK 3: Update Gauge (30s - smooth update)
-# ============================================================
-@app.callback(
-    Output('chart-gauge', 'figure', allow_duplicate=True),
-    [Input('interval-fast', 'n_intervals')],
-    [State('region-filter', 'value'),
-     State('chart-gauge', 'figure')],
-    prevent_initial_call=True
+# KPI text is pure formatting: do it in the browser, no server round-trip
+app.clientside_callback(
+    """
+    function(d) {
+        if (!d) {
+            return ['0', '0 GB', '0 dBm', '0', 'Initializing...'];
+        }
+        var signal = d.signal > 0 ? d.signal.toFixed(1) + ' dBm' : 'N/A';
+        return [
+            d.users.toLocaleString(),
+            d.data_gb.toFixed(2) + ' GB',
+            signal,
+            String(d.towers),
+            d.status
+        ];
+    }
+    """,
+    [Output('kpi-users', 'children'),
+     Output('kpi-data', 'children'),
+     Output('kpi-signal', 'children'),
+     Output('kpi-towers', 'children'),
+     Output('last-update', 'children')],
+    Input('kpi-store', 'data')
 )
-def update_gauge(n, region, existing_fig):
-    """Update gauge value smoothly"""
-    
-    if n == 0 or existing_fig is None:
-        return existing_fig
-    
-    df = get_iot_data()
-    if df.empty:
-        return existing_fig
-    
-    df_filtered = df[df['region'] == region] if region else df
-    avg_drop = df_filtered['call_drop_rate'].mean()
-     # Convert to percentage if needed
-    if avg_drop < 1:
-        avg_drop = avg_drop * 100
-    # Update only the value
-    if existing_fig and 'data' in existing_fig and len(existing_fig['data']) > 0:
-        existing_fig['data'][0]['value'] = avg_drop
-        existing_fig['data'][0]['delta']['reference'] = 2.0
-    
-    return existing_fig
 
 # ============================================================
-# CALLBACK 4: Static Charts (60s)
+# CALLBACK 3: Static Charts (60s)
 # ============================================================
 @app.callback(
     [Output('chart-pie', 'figure'),
@@ -625,10 +976,11 @@ def update_gauge(n, region, existing_fig):
 )
 def update_static_charts(n, region):
     """Update static charts every 60 seconds"""
-    
+
     df = get_iot_data()
-    
-    if df.empty:
+    summary = get_region_summary()
+
+    if df.empty or summary.empty:
         empty = go.Figure()
         empty.add_annotation(text="No Data", font=dict(size=20, color="gray"), 
                            showarrow=False, xref="paper", yref="paper", x=0.5, y=0.5)
@@ -637,21 +989,19 @@ def update_static_charts(n, region):
     
     colors = ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b', '#fa709a']
     
-    # Pie Chart
-    user_dist = df.groupby("region")["active_users"].sum().reset_index()
-    
+    # Pie Chart (per-region totals aggregated in SQL)
     fig_pie = go.Figure(data=[go.Pie(
-        labels=user_dist['region'],
-        values=user_dist['active_users'],
+        labels=summary['region'],
+        values=summary['total_users'],
         hole=0.55,
         marker=dict(colors=colors, line=dict(color='white', width=4)),
         textinfo='label+percent',
         textfont=dict(size=14, color='white', family='Arial Black'),
         hovertemplate='<b>%{label}</b><br>%{value:,} users<br>%{percent}<extra></extra>',
-        pull=[0.08 if i == 0 else 0 for i in range(len(user_dist))]
+        pull=[0.08 if i == 0 else 0 for i in range(len(summary))]
     )])
-    
-    total = user_dist['active_users'].sum()
+
+    total = int(summary['total_users'].sum())
     fig_pie.add_annotation(
         text=f"<b>{total:,}</b><br><span style='font-size:14px'>Total</span>",
         x=0.5, y=0.5,
@@ -669,15 +1019,33 @@ def update_static_charts(n, region):
         uirevision='pie'
     )
     
-    # Heatmap
-    df['minute'] = pd.to_datetime(df['timestamp']).dt.floor('5T')
-    heatmap_data = df.groupby(['minute', 'region'])['active_users'].mean().reset_index()
-    pivot = heatmap_data.pivot(index='region', columns='minute', values='active_users')
-    
+    # Heatmap: 5-minute buckets are one integer division on the raw ns
+    # timestamps, and region x bucket means come from two bincounts —
+    # no per-row calendar floor, no groupby/pivot index machinery
+    arrays = data_cache['arrays']
+    bin_ns = 5 * 60 * 10**9
+    ts_ns = arrays['ts_ns']
+    first_bucket = ts_ns.min() // bin_ns
+    bucket = ts_ns // bin_ns - first_bucket
+    n_buckets = int(bucket.max()) + 1
+
+    region_codes = arrays['region_codes'].astype(np.int64)
+    regions = arrays['region_values']
+    n_cells = len(regions) * n_buckets
+
+    flat = region_codes * n_buckets + bucket
+    sums = np.bincount(flat, weights=arrays['active_users'].astype(np.float64),
+                       minlength=n_cells)
+    counts = np.bincount(flat, minlength=n_cells)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (sums / counts).reshape(len(regions), n_buckets).astype(np.float32)
+
+    bucket_starts = pd.to_datetime((first_bucket + np.arange(n_buckets)) * bin_ns)
+
     fig_heat = go.Figure(data=go.Heatmap(
-        z=pivot.values,
-        x=[t.strftime('%H:%M') for t in pivot.columns],
-        y=pivot.index,
+        z=z,
+        x=[t.strftime('%H:%M') for t in bucket_starts],
+        y=regions,
         colorscale='Viridis',
         hovertemplate='<b>%{y}</b><br>%{x}<br>%{z:.0f} users<extra></extra>',
         colorbar=dict(title="Users", titleside='right')
@@ -695,41 +1063,35 @@ def update_static_charts(n, region):
         uirevision='heatmap'
     )
     
-    # Bar Chart
-    summary = df.groupby("region").agg({
-        'data_usage_mb': 'mean',
-        'active_users': 'mean',
-        'call_drop_rate': 'mean'
-    }).reset_index()
-    
+    # Bar Chart (per-region means aggregated in SQL)
     fig_bar = go.Figure()
-    
+
     fig_bar.add_trace(go.Bar(
         name='Data (MB)',
         x=summary['region'],
-        y=summary['data_usage_mb'],
+        y=summary['avg_data_usage_mb'],
         marker_color='#667eea',
-        text=summary['data_usage_mb'].round(0),
+        text=summary['avg_data_usage_mb'].round(0),
         textposition='outside',
         hovertemplate='<b>%{x}</b><br>%{y:.1f} MB<extra></extra>'
     ))
-    
+
     fig_bar.add_trace(go.Bar(
         name='Users',
         x=summary['region'],
-        y=summary['active_users'],
+        y=summary['avg_active_users'],
         marker_color='#764ba2',
-        text=summary['active_users'].round(0),
+        text=summary['avg_active_users'].round(0),
         textposition='outside',
         hovertemplate='<b>%{x}</b><br>%{y:.0f} users<extra></extra>'
     ))
-    
+
     fig_bar.add_trace(go.Bar(
         name='Drop %',
         x=summary['region'],
-        y=summary['call_drop_rate'] * 10,
+        y=summary['avg_call_drop_rate'] * 10,
         marker_color='#f093fb',
-        text=summary['call_drop_rate'].round(2),
+        text=summary['avg_call_drop_rate'].round(2),
         textposition='outside',
         hovertemplate='<b>%{x}</b><br>%{text:.2f}%<extra></extra>'
     ))